@@ -1,6 +1,8 @@
 import logging
 import math
 from collections.abc import Iterator
+from itertools import pairwise
+from operator import attrgetter
 
 from tola.assembly.assembly import Assembly
 from tola.assembly.assembly_stats import AssemblyStats
@@ -84,8 +86,10 @@ class BuildAssembly(Assembly):
         for prtxt_scffld in prtxt_asm.scaffolds:
             scaffold_namer.make_scaffold_name(prtxt_scffld)
             prtxt_scffld_tags = prtxt_scffld.fragment_tags()
-            for prtxt_frag in prtxt_scffld.fragments():
-                if found := input_asm.find_overlaps(prtxt_frag):
+            prtxt_frags = list(prtxt_scffld.fragments())
+            found_list = input_asm.find_overlaps_batch(prtxt_frags)
+            for prtxt_frag, found in zip(prtxt_frags, found_list, strict=True):
+                if found:
                     scaffold_namer.label_scaffold(
                         found, prtxt_frag, prtxt_scffld_tags, prtxt_scffld.name
                     )
@@ -100,24 +104,27 @@ class BuildAssembly(Assembly):
     def discard_overhanging_fragments(self) -> None:
         multi = self.fragments_found_more_than_once
 
-        while multi:
+        # Premises only change for Fragments in Scaffolds which were fixed in
+        # the previous round, so only those Fragments are reconsidered.
+        dirty = set(multi)
+        while dirty:
             ovr_resolver = OverhangResolver(self.error_length)
-            for fnd in multi.values():
-                for scffld in fnd.scaffolds:
-                    ovr_resolver.add_overhang_premise(fnd.fragment, scffld)
-            fixes_made = ovr_resolver.make_fixes()
-            if fixes_made:
-                for premise in fixes_made:
-                    # Remove the Scaffold we fixed
-                    fk = premise.fragment.key_tuple
-                    if fxd := multi.get(fk):
-                        fxd.remove_scaffold(premise.scaffold)
-                        if fxd.scaffold_count <= 1:
-                            # Fragment is no longer in more than one Scaffold,
-                            # so remove it from fragments_found_more_than_once
-                            del multi[fk]
-            else:
-                break
+            for fk, fnd in multi.items():
+                if fk in dirty:
+                    for scffld in fnd.scaffolds.values():
+                        ovr_resolver.add_overhang_premise(fnd.fragment, scffld)
+            dirty = set()
+            for premise in ovr_resolver.make_fixes():
+                # Remove the Scaffold we fixed
+                fk = premise.fragment.key_tuple
+                dirty.add(fk)
+                dirty.update(f.key_tuple for f in premise.scaffold.fragments())
+                if fxd := multi.get(fk):
+                    fxd.remove_scaffold(premise.scaffold)
+                    if fxd.scaffold_count <= 1:
+                        # Fragment is no longer in more than one Scaffold,
+                        # so remove it from fragments_found_more_than_once
+                        del multi[fk]
 
     def cut_remaining_overhangs(self) -> None:
         multi = self.fragments_found_more_than_once
@@ -133,8 +140,9 @@ class BuildAssembly(Assembly):
         OverlapResult
         """
         frgmnt = fnd.fragment
+
         ordered_scaffolds = sorted(
-            fnd.scaffolds, key=lambda s: s.fragment_start_if_trimmed(frgmnt)
+            fnd.scaffolds.values(), key=lambda s: s.fragment_start_if_trimmed(frgmnt)
         )
 
         sub_fragments = []
@@ -147,10 +155,11 @@ class BuildAssembly(Assembly):
 
         self.assembly_stats.cuts += len(sub_fragments) - 1
 
-        logging.info(
-            f"Contig:\n  {frgmnt.length:15,d}  {frgmnt}\ncut into:\n"
-            + "".join(f"  {sub.length:15,d}  {sub}\n" for sub in sub_fragments)
-        )
+        if logging.getLogger().isEnabledFor(logging.INFO):
+            logging.info(
+                f"Contig:\n  {frgmnt.length:15,d}  {frgmnt}\ncut into:\n"
+                + "".join(f"  {sub.length:15,d}  {sub}\n" for sub in sub_fragments)
+            )
 
     def qc_sub_fragments(
         self, fnd: FoundFragment, sub_fragments: list[Fragment]
@@ -159,18 +168,27 @@ class BuildAssembly(Assembly):
         Check that sub fragments abut each other and do not overlap, and that
         no sequence from the cut fragment has been lost.
         """
+        srtd_frags = sorted(sub_fragments, key=attrgetter("start", "end"))
+
+        # All the sub fragments are cut from the same Fragment, so once they
+        # are sorted by start, whether each neighbouring pair abuts or
+        # overlaps depends only on the end of the first and the start of the
+        # second.
         abut_count = 0
         overlap_count = 0
-        pairs_with_gaps = []
-        srtd_frags = sorted(sub_fragments, key=lambda frag: (frag.start, frag.end))
-        for i, frag_a in enumerate(srtd_frags[:-1]):
-            frag_b = srtd_frags[i + 1]
-            if frag_a.abuts(frag_b):
+        for frag_a, frag_b in pairwise(srtd_frags):
+            if frag_b.start == frag_a.end + 1:
                 abut_count += 1
-            if frag_a.overlaps(frag_b):
+            elif frag_b.start <= frag_a.end:
                 overlap_count += 1
-            if g := frag_a.gap_between(frag_b):
-                pairs_with_gaps.append((frag_a, frag_b, g))
+
+        # Any pairs which neither abut nor overlap must have a gap between
+        # them, so only look for gaps when some pairs are unaccounted for.
+        pairs_with_gaps = []
+        if abut_count + overlap_count != len(srtd_frags) - 1:
+            for frag_a, frag_b in pairwise(srtd_frags):
+                if g := frag_a.gap_between(frag_b):
+                    pairs_with_gaps.append((frag_a, frag_b, g))
 
         sub_frags_length = sum(f.length for f in sub_fragments)
 
@@ -187,18 +205,22 @@ class BuildAssembly(Assembly):
         lgth = len(sub_fragments)
         if abut_count != lgth - 1:
             msg += f"Expecting {lgth - 1} abutting sub fragments but got {abut_count}\n"
+        bp_per_texel = self.bp_per_texel
         for frag_a, frag_b, g in pairs_with_gaps:
-            pixels = g / self.bp_per_texel
+            pixels = g / bp_per_texel
             msg += (
                 f"Gap of length {g} ({pixels:.1f} pixels)"
                 f" between:\n  {frag_a}\nand:\n  {frag_b}\n"
             )
 
         if msg:
-            msg += "\n" + "\n\n".join(str(s) for s in fnd.scaffolds)
+            msg += "\n" + "\n\n".join(str(s) for s in fnd.scaffolds.values())
             raise ValueError(msg)
 
     def log_multi_scaffolds(self) -> None:
+        if not logging.getLogger().isEnabledFor(logging.WARNING):
+            return
+
         multi = self.fragments_found_more_than_once
 
         for fnd in multi.values():
@@ -210,7 +232,7 @@ class BuildAssembly(Assembly):
                         f"{scffld.start_overhang:9d} {scffld.end_overhang:9d}"
                         f"  {scffld.bait} ({scffld.bait.length})"
                     )
-                    for scffld in fnd.scaffolds
+                    for scffld in fnd.scaffolds.values()
                 )
             )
 
@@ -219,35 +241,37 @@ class BuildAssembly(Assembly):
         multi = self.fragments_found_more_than_once
         for ff in scffld.fragments():
             ff_tuple = ff.key_tuple
-            if fnd := store.get(ff_tuple):
+            fnd = store.get(ff_tuple)
+            if fnd is None:
+                fnd = store[ff_tuple] = FoundFragment(ff)
+            else:
                 # Already have it, so record that we've found it more than
                 # once
                 multi[ff_tuple] = fnd
-            else:
-                fnd = FoundFragment(ff)
-                store[ff_tuple] = fnd
             fnd.add_scaffold(scffld)
 
     def add_missing_scaffolds_from_input(self, input_asm: Assembly) -> None:
         scaffold_namer = self.scaffold_namer
-        found_frags = self.found_fragments
+        get_found = self.found_fragments.get
+        default_gap = self.default_gap
         for scffld in input_asm.scaffolds:
             new_scffld = None
             last_added_i = None
             for i, frag in scffld.idx_fragments():
-                if not found_frags.get(frag.key_tuple):
+                if get_found(frag.key_tuple) is None:
                     if not new_scffld:
                         new_scffld = Scaffold(scffld.name)
                         new_scffld.rank = 3
+                        add_row = new_scffld.add_row
                     if last_added_i is not None and last_added_i != i - 1:
                         # Last added row was not the previous row in the
                         # scaffold
                         prev_row = scffld.rows[i - 1]
                         if isinstance(prev_row, Gap):
-                            new_scffld.add_row(prev_row)
+                            add_row(prev_row)
                         else:
-                            new_scffld.add_row(self.default_gap)
-                    new_scffld.add_row(frag)
+                            add_row(default_gap)
+                    add_row(frag)
                     last_added_i = i
 
             if new_scffld:
@@ -293,28 +317,35 @@ class BuildAssembly(Assembly):
         return assemblies
 
     def scaffolds_fused_by_name(self) -> Iterator[Scaffold]:
-        gap = self.default_gap
-        hap_name_scaffold = {}
+        # Group the scaffolds by haplotype and name in a single pass
+        hap_name_groups = {}
         for scffld in self.scaffolds:
             if not scffld.rows:
                 # discard_overhanging_fragments() may have removed the only
                 # row from an OverlapResult
                 continue
-
-            build_scffld = hap_name_scaffold.setdefault(
-                (scffld.haplotype, scffld.name),
-                Scaffold(
-                    scffld.name,
-                    tag=scffld.tag,
-                    haplotype=scffld.haplotype,
-                    rank=scffld.rank,
-                    original_name=scffld.original_name,
-                ),
+            hap_name_groups.setdefault((scffld.haplotype, scffld.name), []).append(
+                scffld
             )
-            if isinstance(scffld, OverlapResult):
-                build_scffld.append_scaffold(scffld.to_scaffold(), gap)
-            else:
-                build_scffld.append_scaffold(scffld)
 
-        for scffld in hap_name_scaffold.values():
-            yield scffld
+        # Then build each fused Scaffold from the rows of its group, taking
+        # its other attributes from the first scaffold in the group
+        gap = self.default_gap
+        for group in hap_name_groups.values():
+            rows = []
+            for scffld in group:
+                if isinstance(scffld, OverlapResult):
+                    if gap and rows:
+                        rows.append(gap)
+                    rows.extend(scffld.to_scaffold().rows)
+                else:
+                    rows.extend(scffld.rows)
+            frst = group[0]
+            yield Scaffold(
+                frst.name,
+                rows,
+                tag=frst.tag,
+                haplotype=frst.haplotype,
+                rank=frst.rank,
+                original_name=frst.original_name,
+            )
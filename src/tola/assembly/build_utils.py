@@ -3,13 +3,32 @@ Utility objects used by BuildAssembly
 """
 
 import logging
-import re
+import sys
 import textwrap
+from operator import attrgetter
 
-from tola.assembly.fragment import Fragment
+from tola.assembly.fragment import KNOWN_TAGS, Fragment
 from tola.assembly.overlap_result import OverlapResult
 from tola.assembly.scaffold import Scaffold
 
+# Characters of Roman numeral chromosome names. e.g. "IV", "X_V"
+_ROMAN_CHR_NAME_CHARS = frozenset("IVX_")
+
+
+def is_chr_name(tag: str) -> bool:
+    """
+    Does the tag look like a chromosome name? i.e. an upper case letter
+    followed by zero or more digits ("X", "B1") or a Roman numeral ("IV").
+    Both forms are checked with string and set methods rather than a regex.
+    """
+    if "A" <= tag[:1] <= "Z" and (len(tag) == 1 or tag[1:].isdecimal()):
+        return True
+    return bool(tag) and _ROMAN_CHR_NAME_CHARS.issuperset(tag)
+
+
+# First suffix letter used by ChrGroup.multi_chr_list()
+_ORD_A = ord("A")
+
 
 class ScaffoldNamer:
     """
@@ -33,12 +52,9 @@ class ScaffoldNamer:
         # Halplotype names stored under their lower case names
         self.haplotype_lc_dict = {}
 
-    OTHER_KNOWN_TAGS = {
-        "Contaminant",
-        "Cut",
-        "Haplotig",
-        "Unloc",
-    }
+        # Haplotype name for each haplotype tag seen, so that the lower case
+        # lookup is only done once per distinct tag
+        self.haplotype_by_tag = {}
 
     def make_scaffold_name(self, scaffold: Scaffold) -> None:
         """
@@ -47,15 +63,16 @@ class ScaffoldNamer:
         """
         scaffold_name = None
         haplotype = None
-        is_painted = False  # Has HiC contacts
         rank = None
 
-        for tag in scaffold.fragment_tags():
-            if tag == "Painted":
-                is_painted = True
-            elif tag == "Target":
-                self.target_tags = True
-            elif re.fullmatch(r"([A-Z]\d*|[IVX_]+)", tag):
+        tags = scaffold.fragment_tags()
+        is_painted = "Painted" in tags  # Has HiC contacts
+        if "Target" in tags:
+            self.target_tags = True
+
+        hap_by_tag = self.haplotype_by_tag
+        for tag in tags - KNOWN_TAGS:
+            if is_chr_name(tag):
                 # This tag looks like a chromosome name
                 if scaffold_name and tag != scaffold_name:
                     msg = (
@@ -65,20 +82,23 @@ class ScaffoldNamer:
                     raise ValueError(msg)
                 scaffold_name = tag
                 rank = 2
-            elif tag not in self.OTHER_KNOWN_TAGS:
+            else:
                 # Any tag that doesn't look like a chromosome name is assumed
-                # to be a haplotype, and we only expect to find one within
-                # each Pretext Scaffold
+                # to be a haplotype. We only expect to find one haplotype tag
+                # within each Pretext Scaffold
                 if haplotype:
                     msg = (
                         f"Found both '{haplotype}' and '{tag}', when only one'"
                         f" is expected, in scaffold:\n\n{scaffold}"
                     )
                     raise ValueError(msg)
-                else:
+                haplotype = hap_by_tag.get(tag)
+                if haplotype is None:
                     # The first occurance of a haplotype tag sets its case.
                     # i.e.  "Hap1" will be used if it is seen before "HAP1".
-                    haplotype = self.haplotype_lc_dict.setdefault(tag.lower(), tag)
+                    haplotype = hap_by_tag[tag] = self.haplotype_lc_dict.setdefault(
+                        sys.intern(tag.lower()), tag
+                    )
 
         if not scaffold_name:
             if is_painted:
@@ -95,9 +115,11 @@ class ScaffoldNamer:
                 # with the name of a haplotype?  (This will fail if unplaced
                 # contigs from a haplotype appear before the first Scaffold
                 # assigned to that haplotype in the Pretext Assembly.)
-                if not haplotype and (m := re.match(r"([^_]+)_", scaffold_name)):
-                    lc_prefix = m.group(1).lower()
-                    haplotype = self.haplotype_lc_dict.get(lc_prefix)
+                if not haplotype:
+                    # Possible haplotype name prefix, e.g. "Hap2_"
+                    prefix, sep, _ = scaffold_name.partition("_")
+                    if prefix and sep:
+                        haplotype = self.haplotype_lc_dict.get(prefix.lower())
 
         self.current_scaffold_name = scaffold_name
         self.current_rank = rank
@@ -109,20 +131,21 @@ class ScaffoldNamer:
         self,
         scaffold: Scaffold,
         fragment: Fragment,
-        scaffold_tags: set[str],
+        scaffold_tags: frozenset[str],
         original_name: str,
     ) -> None:
         name = self.current_scaffold_name
         rank = self.current_rank
-        if "Contaminant" in fragment.tags:
+        frag_tags = fragment.tags
+        if "Contaminant" in frag_tags:
             scaffold.tag = "Contaminant"
             rank = 3
-        elif "Haplotig" in fragment.tags:
+        elif "Haplotig" in frag_tags:
             name = self.haplotig_name()
             scaffold.tag = "Haplotig"
             rank = 3
             self.haplotig_scaffolds.append(scaffold)
-        elif "Unloc" in fragment.tags:
+        elif "Unloc" in frag_tags:
             if "Painted" not in scaffold_tags:
                 msg = f"Unloc in unpainted scaffold {original_name!r}: {fragment}"
                 raise ValueError(msg)
@@ -152,10 +175,8 @@ class ScaffoldNamer:
         self.rename_by_size(self.unloc_scaffolds)
 
     def rename_by_size(self, scaffolds: list[Scaffold]) -> None:
-        if not scaffolds:
-            return
         names = [s.name for s in scaffolds]
-        by_size = sorted(scaffolds, key=lambda s: s.length, reverse=True)
+        by_size = sorted(scaffolds, key=attrgetter("length"), reverse=True)
         for s, n in zip(by_size, names, strict=True):
             s.name = n
 
@@ -167,12 +188,7 @@ class ChrGroup:
     """
 
     def __init__(self, haplotypes):
-        self.data = data = {}
-        for hap in haplotypes:
-            data[hap] = {}
-
-    def haplotype_dict(self, hap_name):
-        return self.data.get(hap_name)
+        self.data = {hap: {} for hap in haplotypes}
 
     def length_of_first_haplotype(self):
         first, *_ = self.data.values()
@@ -201,10 +217,7 @@ class ChrGroup:
         if multi_count == 1:
             return [chr_name]
         else:
-            chr_list = []
-            for ltr in range(ord("A"), ord("A") + multi_count):
-                chr_list.append(chr_name + chr(ltr))
-            return chr_list
+            return [chr_name + chr(_ORD_A + i) for i in range(multi_count)]
 
     def name_chromosome(self, chr_prefix, chr_n):
         """
@@ -219,10 +232,18 @@ class ChrGroup:
         """
         for hap_set in self.data.values():
             chr_names = self.multi_chr_list(chr_prefix + str(chr_n), len(hap_set))
-            for orig, scffld_list in hap_set.items():
-                this_chr = chr_names.pop(0)
+            for (orig, scffld_list), this_chr in zip(
+                hap_set.items(), chr_names, strict=True
+            ):
+                orig_len = len(orig)
                 for scffld in scffld_list:
-                    scffld.name = scffld.name.replace(orig, this_chr)
+                    name = scffld.name
+                    if name.startswith(orig):
+                        # The usual case, where the name is the original
+                        # name, or the original name with an "_unloc_" suffix
+                        scffld.name = this_chr + name[orig_len:]
+                    else:
+                        scffld.name = name.replace(orig, this_chr)
 
 
 class ChrNamer:
@@ -275,7 +296,7 @@ class ChrNamer:
                 raise ValueError(msg)
 
             # Do we already have a scaffold in this haplotype in the ChrGroup?
-            if group.haplotype_dict(haplotype):
+            if group.data[haplotype]:
                 if other_haplotypes:
                     if haplotype != last_haplotype:
                         # New haplotype which already has an entry in this
@@ -306,105 +327,133 @@ class ChrNamer:
             #           },
             #       }
             #   )
-            group.haplotype_dict(haplotype).setdefault(orig, []).append(scffld)
+            hap_dict = group.data[haplotype]
+            orig_list = hap_dict.get(orig)
+            if orig_list is None:
+                hap_dict[orig] = [scffld]
+            else:
+                orig_list.append(scffld)
             last_haplotype = haplotype
             last_orig = orig
 
 
 class FoundFragment:
     """
-    Little object to store a Fragment found and the list of Scaffolds it was
-    found in.
+    Little object to store a Fragment found and the Scaffolds it was found
+    in. The Scaffolds are stored in a dict keyed by their `id()`, so that
+    they can be removed without a linear search, while keeping the order
+    in which they were added.
     """
 
     __slots__ = "fragment", "scaffolds"
 
     def __init__(self, fragment: Fragment):
         self.fragment = fragment
-        self.scaffolds = []
+        self.scaffolds = {}
 
     @property
     def scaffold_count(self):
         return len(self.scaffolds)
 
     def add_scaffold(self, scaffold: Scaffold) -> None:
-        self.scaffolds.append(scaffold)
+        self.scaffolds[id(scaffold)] = scaffold
 
     def remove_scaffold(self, scaffold: Scaffold) -> None:
-        self.scaffolds.remove(scaffold)
+        del self.scaffolds[id(scaffold)]
 
 
 class OverhangPremise:
     """
     Stores a "what-if" for removal of a terminal (start or end) Fragment. Used
     to decide which OverlapResult to remove a Fragment from, where the
-    Fragment is present in more than one OverlapResult.
-    """
+    Fragment is present in more than one OverlapResult. `at_start` says
+    which end of the OverlapResult the Fragment is at.
 
-    __slots__ = "scaffold", "fragment"
+    The row count check, bait overlap and overhang values are computed
+    together from the scaffold the first time any of them is needed, and
+    then stored.
+    """
 
-    def __init__(self, scaffold: OverlapResult, fragment: Fragment):
+    __slots__ = (
+        "scaffold",
+        "fragment",
+        "at_start",
+        "_is_single_row",
+        "_bait_overlap",
+        "_overhang_if_applied",
+        "_overhang_error_delta_if_applied",
+    )
+
+    def __init__(self, scaffold: OverlapResult, fragment: Fragment, at_start: bool):
         self.scaffold = scaffold
         self.fragment = fragment
+        self.at_start = at_start
+        self._bait_overlap = None
 
     def __str__(self):
         return (
-            f"{self.__class__.__name__}\n"
+            f"{'Start' if self.at_start else 'End'}OverhangPremise\n"
             f"  bait overlap: {self.bait_overlap:12_d}\n  if applied:\n"
             f"      overhang: {self.overhang_if_applied:12_d}\n"
             f"   error delta: {self.overhang_error_delta_if_applied:12_d}\n\n"
             + textwrap.indent(f"{self.scaffold}\n", "  ")
         )
 
-    def improves(self, err_length) -> bool:
-        if len(self.scaffold.rows) == 1:
-            return False
-        return self.overhang_error_delta_if_applied < 0 and (
-            # Guard against removing fragments which would produce a large
-            # negative overhang - they should be cut instead.
-            self.overhang_if_applied > -3 * err_length
-        )
-
-    def makes_worse(self, err_length) -> bool:
-        return not self.improves(err_length)
-
+    def evaluate(self) -> None:
+        scffld = self.scaffold
+        self._is_single_row = len(scffld.rows) == 1
+        if self.at_start:
+            overhang = scffld.overhang_if_start_removed()
+            self._bait_overlap = scffld.start_row_bait_overlap
+            current = scffld.start_overhang
+        else:
+            overhang = scffld.overhang_if_end_removed()
+            self._bait_overlap = scffld.end_row_bait_overlap
+            current = scffld.end_overhang
+        self._overhang_if_applied = overhang
+        self._overhang_error_delta_if_applied = abs(overhang) - abs(current)
 
-class StartOverhangPremise(OverhangPremise):
     @property
     def bait_overlap(self) -> int:
-        return self.scaffold.start_row_bait_overlap
+        if self._bait_overlap is None:
+            self.evaluate()
+        return self._bait_overlap
 
     @property
     def overhang_if_applied(self) -> int:
-        return self.scaffold.overhang_if_start_removed()
+        if self._bait_overlap is None:
+            self.evaluate()
+        return self._overhang_if_applied
 
     @property
     def overhang_error_delta_if_applied(self) -> int:
-        return abs(self.scaffold.overhang_if_start_removed()) - abs(
-            self.scaffold.start_overhang
-        )
-
-    def apply(self) -> None:
-        self.scaffold.discard_start()
+        if self._bait_overlap is None:
+            self.evaluate()
+        return self._overhang_error_delta_if_applied
 
+    def improves(self, err_length) -> bool:
+        if self._bait_overlap is None:
+            self.evaluate()
+        if self._is_single_row:
+            return False
+        return self._overhang_error_delta_if_applied < 0 and (
+            # Guard against removing fragments which would produce a large
+            # negative overhang - they should be cut instead.
+            self._overhang_if_applied > -3 * err_length
+        )
 
-class EndOverhangPremise(OverhangPremise):
-    @property
-    def bait_overlap(self) -> int:
-        return self.scaffold.end_row_bait_overlap
+    def makes_worse(self, err_length) -> bool:
+        return not self.improves(err_length)
 
-    @property
-    def overhang_if_applied(self) -> int:
-        return self.scaffold.overhang_if_end_removed()
+    def apply(self) -> None:
+        if self.at_start:
+            self.scaffold.discard_start()
+        else:
+            self.scaffold.discard_end()
 
-    @property
-    def overhang_error_delta_if_applied(self) -> int:
-        return abs(self.scaffold.overhang_if_end_removed()) - abs(
-            self.scaffold.end_overhang
-        )
 
-    def apply(self) -> None:
-        self.scaffold.discard_end()
+# Sort key for OverhangPremises, best first
+_ERR_DELTA_KEY = attrgetter("overhang_error_delta_if_applied")
 
 
 class OverhangResolver:
@@ -420,27 +469,40 @@ class OverhangResolver:
         self.error_length = error_length
 
     def add_overhang_premise(self, fragment: Fragment, scffld: OverlapResult) -> None:
-        if scffld.rows[0] is fragment:
-            premise = StartOverhangPremise(scffld, fragment)
-        elif scffld.rows[-1] is fragment:
-            premise = EndOverhangPremise(scffld, fragment)
+        rows = scffld.rows
+        if rows[0] is fragment:
+            premise = OverhangPremise(scffld, fragment, True)
+        elif rows[-1] is fragment:
+            premise = OverhangPremise(scffld, fragment, False)
         else:
             return
 
         fk = fragment.key_tuple
-        self.premises_by_fragment_key.setdefault(fk, []).append(premise)
+        prem_list = self.premises_by_fragment_key.get(fk)
+        if prem_list is None:
+            self.premises_by_fragment_key[fk] = [premise]
+        else:
+            prem_list.append(premise)
 
     def make_fixes(self) -> list[OverlapResult]:
         fixes_made = []
         err_length = self.error_length
 
+        log_debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+
         for prem_list in self.premises_by_fragment_key.values():
             prem_count = len(prem_list)
+            if prem_count < 2:
+                # Can only discard overhanging fragments present in more than
+                # one Scaffold, or we would be removing sequence data from
+                # the assembly.
+                continue
 
-            logging.debug(
-                f"\n{prem_count} OverhangPremises for {prem_list[0].fragment}:\n"
-                + textwrap.indent("".join(f"\n{prem}" for prem in prem_list), "  ")
-            )
+            if log_debug:
+                logging.debug(
+                    f"\n{prem_count} OverhangPremises for {prem_list[0].fragment}:\n"
+                    + textwrap.indent("".join(f"\n{prem}" for prem in prem_list), "  ")
+                )
 
             if prem_count == 2:
                 # To prevent cuts being made which result in Fragments smaller
@@ -456,17 +518,20 @@ class OverhangResolver:
                         fixes_made.append(scnd)
                     continue
 
-            if prem_count > 1:
-                # Can only discard overhanging fragments present in more than
-                # one Scaffold, or we would be removing sequence data from
-                # the assembly.
-                best_to_worst = sorted(
-                    prem_list, key=lambda x: x.overhang_error_delta_if_applied
-                )
+                if (
+                    frst.overhang_error_delta_if_applied
+                    <= scnd.overhang_error_delta_if_applied
+                ):
+                    bst, nxt = frst, scnd
+                else:
+                    bst, nxt = scnd, frst
+            else:
+                best_to_worst = sorted(prem_list, key=_ERR_DELTA_KEY)
                 bst = best_to_worst[0]
                 nxt = best_to_worst[1]
-                if bst.improves(err_length) and nxt.makes_worse(err_length):
-                    bst.apply()  # Remove the overhanging fragment
-                    fixes_made.append(bst)
+
+            if bst.improves(err_length) and nxt.makes_worse(err_length):
+                bst.apply()  # Remove the overhanging fragment
+                fixes_made.append(bst)
 
         return fixes_made
@@ -9,21 +9,19 @@ def format_agp(asm, file):
     for line in asm.header:
         file.write(f"# {line}\n")
     for scffld in asm.scaffolds:
+        # Build all the lines for each Scaffold, then write them at once
         scffld_name = scffld.name
+        lines = []
         p = 0
-        for i, row in enumerate(scffld.rows):
-            cols = [
-                scffld_name,
-                str(p + 1),
-                str(p + row.length),
-                str(i + 1),
-            ]
-            p += row.length
+        for i, row in enumerate(scffld.rows, 1):
+            length = row.length
+            cols = [scffld_name, str(p + 1), str(p + length), str(i)]
+            p += length
             if isinstance(row, Gap):
                 cols.extend(
                     (
                         "U",
-                        str(row.length),
+                        str(length),
                         str(row.gap_type),
                         "yes",
                         "proximity_ligation",
@@ -41,8 +39,8 @@ def format_agp(asm, file):
                 )
                 if m := row.tags:
                     cols.extend(m)
-            file.write("\t".join(cols))
-            file.write("\n")
+            lines.append("\t".join(cols) + "\n")
+        file.write("".join(lines))
 
 
 def format_tpf(asm, file):
@@ -55,33 +53,22 @@ def format_tpf(asm, file):
     for line in asm.header:
         file.write(f"## {line}\n")
     for scffld in asm.scaffolds:
+        # Build all the lines for each Scaffold, then write them at once
         scffld_name = scffld.name
+        lines = []
         for row in scffld.rows:
             if isinstance(row, Gap):
-                file.write(
-                    "\t".join(
-                        (
-                            "GAP",
-                            gap_type_dict.get(
-                                row.gap_type,
-                                row.gap_type.translate(tr),
-                            ),
-                            str(row.length),
-                        ),
-                    ),
+                gap_type = gap_type_dict.get(
+                    row.gap_type,
+                    row.gap_type.translate(tr),
                 )
+                lines.append(f"GAP\t{gap_type}\t{row.length}\n")
             else:
-                file.write(
-                    "\t".join(
-                        (
-                            "?",
-                            f"{row.name}:{row.start}-{row.end}",
-                            scffld_name,
-                            STRAND_STR[row.strand],
-                        ),
-                    ),
+                lines.append(
+                    f"?\t{row.name}:{row.start}-{row.end}"
+                    f"\t{scffld_name}\t{STRAND_STR[row.strand]}\n"
                 )
-            file.write("\n")
+        file.write("".join(lines))
 
 
 @cache
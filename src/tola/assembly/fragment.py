@@ -1,49 +1,46 @@
+import sys
+
+# Pretext tags with a meaning when building an assembly. Any other tag is a
+# chromosome or haplotype name.
+KNOWN_TAGS = frozenset(
+    (
+        "Contaminant",
+        "Cut",
+        "Haplotig",
+        "Painted",
+        "Target",
+        "Unloc",
+    )
+)
+
+
 class Fragment:
-    __slots__ = "_name", "_start", "_end", "_strand", "_tags"
+    # Plain slots rather than read-only properties, since these attributes
+    # are read in the tightest loops. Fragments are treated as immutable;
+    # reverse() and rename() return new Fragments.
+    __slots__ = "name", "start", "end", "strand", "tags", "length", "key_tuple"
 
     def __init__(self, name, start, end, strand, tags=()):
-        self._name = str(name)
-        self._start = int(start)
-        self._end = int(end)
-        self._strand = int(strand)
-        self._tags = tags
-
-        if self.strand not in (0, 1, -1):
-            msg = f"strand '{self.strand}' should be one of: 0, 1, -1"
+        # Names are drawn from a small pool of sequence names, and are
+        # compared in every overlap test, so are interned.
+        self.name = sys.intern(str(name))
+        self.start = start = int(start)
+        self.end = end = int(end)
+        self.strand = strand = int(strand)
+        self.tags = tags  # tuple of tags data, empty if there is none
+
+        if strand not in (0, 1, -1):
+            msg = f"strand '{strand}' should be one of: 0, 1, -1"
             raise ValueError(msg)
 
-        if self.start > self.end:
-            msg = f"start '{self.start}' must be <= end '{self.end}'"
+        if start > end:
+            msg = f"start '{start}' must be <= end '{end}'"
             raise ValueError(msg)
 
-    @property
-    def name(self):
-        return self._name
-
-    @property
-    def start(self):
-        return self._start
-
-    @property
-    def end(self):
-        return self._end
+        self.length = end - start + 1
 
-    @property
-    def strand(self):
-        return self._strand
-
-    @property
-    def tags(self):
-        """tuple of tags data, empty if there is none"""
-        return self._tags
-
-    @property
-    def length(self):
-        return self._end - self._start + 1
-
-    @property
-    def key_tuple(self) -> tuple:
-        return self._name, self._start, self._end
+        # Built once, since it is used as a dict key in tight loops
+        self.key_tuple = self.name, start, end
 
     def junction_tuple(self, othr) -> tuple:
         """
@@ -82,14 +79,17 @@ class Fragment:
         """
         return self.STRAND_STR[self.strand]
 
-    def attr_values(self):
-        return tuple(self.__getattribute__(x) for x in self.__slots__)
-
     def __eq__(self, othr):
         if self is othr:
             return True
         else:
-            return self.attr_values() == othr.attr_values()
+            # The prebuilt key holds the name, start and end, so compare it
+            # first rather than building tuples of every slot.
+            return (
+                self.key_tuple == othr.key_tuple
+                and self.strand == othr.strand
+                and self.tags == othr.tags
+            )
 
     def __str__(self):
         return f"{self.name}:{self.start}-{self.end}({self.strand_str})" + (
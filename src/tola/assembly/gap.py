@@ -2,7 +2,7 @@ from functools import cache
 
 
 class Gap:
-    __slots__ = "_length", "_gap_type"
+    __slots__ = "length", "gap_type"
 
     @cache
     def __new__(cls, *args, **kwargs):
@@ -12,16 +12,10 @@ class Gap:
         return super(Gap, cls).__new__(cls)
 
     def __init__(self, length, gap_type):
-        self._length = int(length)
-        self._gap_type = str(gap_type)
-
-    @property
-    def length(self):
-        return self._length
-
-    @property
-    def gap_type(self):
-        return self._gap_type
+        # Plain slots, read directly when summing Scaffold lengths. Gaps are
+        # shared between Scaffolds, so must never be modified.
+        self.length = int(length)
+        self.gap_type = str(gap_type)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(length={self.length}, gap_type='{self.gap_type}')"
@@ -1,8 +1,32 @@
+from bisect import bisect_left, bisect_right
+
 from tola.assembly.assembly import Assembly
 from tola.assembly.gap import Gap
 from tola.assembly.overlap_result import OverlapResult
 
 
+def overlap_span(starts, ends, start, end, lo=0):
+    """
+    Given the sorted start and end positions of the rows in a Scaffold,
+    returns the indices of the first and last rows which overlap the region
+    from `start` to `end`, or `None` if no rows overlap it. Rows before
+    index `lo` are known not to overlap and are not searched. Works only on
+    integer positions, so no rows need to be touched during the searches.
+    """
+
+    # Binary search for the last row which starts at or before the end of
+    # the region.
+    j_ovr = bisect_right(starts, end, lo) - 1
+    if j_ovr < lo or ends[j_ovr] < start:
+        return None
+
+    # Binary search for the first row which ends at or after the start of
+    # the region. Row `j_ovr` does, so it bounds the search.
+    i_ovr = bisect_left(ends, start, lo, j_ovr)
+
+    return i_ovr, j_ovr
+
+
 class IndexedAssembly(Assembly):
     def __init__(self, name, header=None, scaffolds=None):
         self.name = str(name)
@@ -26,16 +50,19 @@ class IndexedAssembly(Assembly):
             msg = f"Already have Scaffold named '{scffld.name}'"
             raise ValueError(msg)
 
-        # Index rows by their end position in the Scaffold
+        # Keep the start and end positions of the rows in the Scaffold as two
+        # sorted lists, which overlap_span() searches with bisect.
         end = 0
-        idx = []
+        starts = []
+        ends = []
         for row in scffld.rows:
+            starts.append(end + 1)
             end += row.length
-            idx.append(end)
+            ends.append(end)
 
         # Store the Scaffold and its index
         self._scaffold_dict[scffld.name] = scffld
-        self._scaffold_index[scffld.name] = idx
+        self._scaffold_index[scffld.name] = starts, ends
 
     def scaffold_by_name(self, name):
         if scffld := self._scaffold_dict.get(name):
@@ -44,60 +71,69 @@ class IndexedAssembly(Assembly):
             msg = f"No such Scaffold '{name}' in Assembly '{self.name}'"
             raise ValueError(msg)
 
-    def find_overlaps(self, bait):
+    def indexed_scaffold(self, name):
         """
-        Given a Fragment bait, returns an OverlapResult (a subclass of
-        Scaffold) with rows from the Scaffold within the IndexedAssembly
-        which overlap. Any leading or trailing Gaps in the overlapping rows
-        are removed.
+        Returns the named Scaffold along with the lists of its row start and
+        end positions.
         """
-        scffld = self.scaffold_by_name(bait.name)
+        scffld = self.scaffold_by_name(name)
         if not scffld.rows:
             msg = f"Scaffold '{scffld.name}' is empty"
             raise ValueError(msg)
 
-        idx = self._scaffold_index.get(bait.name)
+        idx = self._scaffold_index.get(name)
         if not idx:
             msg = f"Scaffold '{scffld.name}' is not indexed."
             raise ValueError(msg)
+        starts, ends = idx
 
-        bait_start = bait.start
-        bait_end = bait.end
-
-        # Binary search: a = left; m = midpoint; z = right
-        a = 0
-        z = len(idx)
-        ovr = None
-        while a < z:
-            m = a + ((z - a) // 2)
-            scffld_start = 1 if m == 0 else 1 + idx[m - 1]
-            scffld_end = idx[m]
-            if scffld_end < bait_start:
-                # Scaffold row at "m" is to the left of the bait
-                a = m + 1
-            elif scffld_start > bait_end:
-                # Scaffold row at "m" is to the right of the bait
-                z = m
-            else:
-                # Must be overlapping
-                ovr = m
-                break
-
-        if ovr is None:
-            return None
+        return scffld, starts, ends
 
-        # The span of overlapping entries may extend to the left or right
-        # of "ovr"
-        i_ovr = j_ovr = ovr
-        for i in range(ovr - 1, -1, -1):  # if ovr == 4, range will be [3, 2, 1, 0]
-            if idx[i] < bait_start:
-                break
-            i_ovr = i
-        for j in range(ovr + 1, len(idx)):
-            s_start = 1 if j == 0 else 1 + idx[j - 1]
-            if s_start > bait_end:
-                break
-            j_ovr = j
+    def find_overlaps(self, bait):
+        """
+        Given a Fragment bait, returns an OverlapResult (a subclass of
+        Scaffold) with rows from the Scaffold within the IndexedAssembly
+        which overlap. Any leading or trailing Gaps in the overlapping rows
+        are removed.
+        """
+        scffld, starts, ends = self.indexed_scaffold(bait.name)
+        span = overlap_span(starts, ends, bait.start, bait.end)
+        return self.overlap_result(bait, scffld, starts, ends, span)
+
+    def find_overlaps_batch(self, baits):
+        """
+        Returns a list of what find_overlaps() would return for each of the
+        Fragments in `baits`, in the same order. The baits are grouped by
+        Scaffold and searched in order of their start positions, so that
+        each search starts from the first row found for the previous bait.
+        """
+        results = [None] * len(baits)
+        baits_by_name = {}
+        for n, bait in enumerate(baits):
+            baits_by_name.setdefault(bait.name, []).append(n)
+
+        for name, bait_numbers in baits_by_name.items():
+            scffld, starts, ends = self.indexed_scaffold(name)
+            bait_numbers.sort(key=lambda n: baits[n].start)
+            lo = 0
+            for n in bait_numbers:
+                bait = baits[n]
+                span = overlap_span(starts, ends, bait.start, bait.end, lo)
+                if span:
+                    lo = span[0]
+                results[n] = self.overlap_result(bait, scffld, starts, ends, span)
+
+        return results
+
+    @staticmethod
+    def overlap_result(bait, scffld, starts, ends, span):
+        """
+        Builds the OverlapResult for the `span` of rows found by
+        overlap_span(), with any leading or trailing Gaps removed.
+        """
+        if span is None:
+            return None
+        i_ovr, j_ovr = span
 
         # Walk start and end pointers back to ignore Gaps on the ends
         while isinstance(scffld.rows[i_ovr], Gap):
@@ -108,8 +144,8 @@ class IndexedAssembly(Assembly):
             return None
 
         overlaps = scffld.rows[i_ovr : j_ovr + 1]
-        overlap_start = 1 if i_ovr == 0 else 1 + idx[i_ovr - 1]
-        overlap_end = idx[j_ovr]
+        overlap_start = starts[i_ovr]
+        overlap_end = ends[j_ovr]
 
         return OverlapResult(
             bait=bait,
@@ -1,9 +1,10 @@
 import re
 import string
+import sys
 from functools import cache
 
 from tola.assembly.assembly import Assembly
-from tola.assembly.fragment import Fragment
+from tola.assembly.fragment import KNOWN_TAGS, Fragment
 from tola.assembly.gap import Gap
 from tola.assembly.scaffold import Scaffold
 
@@ -33,7 +34,7 @@ def parse_agp(file, name):
         fields = line.rstrip().split("\t")
 
         if fields[0] != scaffold_name:
-            scaffold_name = fields[0]
+            scaffold_name = sys.intern(fields[0])
             scaffold = Scaffold(scaffold_name)
             asm.add_scaffold(scaffold)
 
@@ -51,8 +52,9 @@ def parse_agp(file, name):
                     start=fields[6],
                     end=fields[7],
                     strand=strand_dict[fields[8]],
-                    # Tenth fields onwards added as tags metadata
-                    tags=tuple(fields[9:]),
+                    # Tenth fields onwards added as tags metadata. Tags are
+                    # drawn from a small vocabulary, so are interned.
+                    tags=tuple(map(canonical_tag, fields[9:])),
                 ),
             )
 
@@ -99,7 +101,7 @@ def parse_tpf(file, name):
                 raise ValueError(msg)
         elif len(fields) == 4:
             if fields[2] != scaffold_name:
-                scaffold_name = fields[2]
+                scaffold_name = sys.intern(fields[2])
                 scaffold = Scaffold(scaffold_name)
                 asm.add_scaffold(scaffold)
             if m := re.match(r"(.+):(\d+)-(\d+)$", fields[1]):
@@ -121,6 +123,19 @@ def parse_tpf(file, name):
     return asm
 
 
+# Known tags stored under their lower case names, so that e.g. "painted" or
+# "CONTAMINANT" are still recognised
+_KNOWN_TAGS_LC = {tag.lower(): tag for tag in KNOWN_TAGS}
+
+
+@cache
+def canonical_tag(tag):
+    """
+    Returns the interned tag, in its canonical case if it is a known tag.
+    """
+    return sys.intern(_KNOWN_TAGS_LC.get(tag.lower(), tag))
+
+
 @cache
 def lowercase_and_dash_to_underscore():
     return str.maketrans(
@@ -1,4 +1,5 @@
 import io
+from itertools import chain
 
 from tola.assembly.fragment import Fragment
 from tola.assembly.gap import Gap
@@ -86,11 +87,7 @@ class Scaffold:
                 yield i, row
 
     def fragment_tags(self):
-        tag_set = set()
-        for frag in self.fragments():
-            for t in frag.tags:
-                tag_set.add(t)
-        return tag_set
+        return frozenset(chain.from_iterable(frag.tags for frag in self.fragments()))
 
     def reverse(self):
         new = self.__class__(self.name)
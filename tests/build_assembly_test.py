@@ -6,10 +6,17 @@ import pytest
 
 from tola.assembly.assembly import Assembly
 from tola.assembly.build_assembly import BuildAssembly
-from tola.assembly.build_utils import ChrGroup, ChrNamer, ScaffoldNamer
+from tola.assembly.build_utils import (
+    ChrGroup,
+    ChrNamer,
+    FoundFragment,
+    ScaffoldNamer,
+    is_chr_name,
+)
 from tola.assembly.fragment import Fragment
 from tola.assembly.gap import Gap
 from tola.assembly.indexed_assembly import IndexedAssembly
+from tola.assembly.overlap_result import OverlapResult
 from tola.assembly.scaffold import Scaffold
 
 
@@ -138,6 +145,81 @@ def test_unpainted_unloc():
         )
 
 
+def test_is_chr_name():
+    for tag in ("X", "W", "B1", "B12", "IV", "X_V", "XI"):
+        assert is_chr_name(tag)
+    for tag in ("", "x", "Xb", "B1a", "Hap1", "12", "_A", "Painted"):
+        assert not is_chr_name(tag)
+
+
+@pytest.mark.parametrize(
+    "tags,name,rank,haplotype",
+    [
+        (("Painted",), "Scaffold_1", 1, None),
+        (("Painted", "X"), "X", 2, None),
+        (("Painted", "B12", "Hap1"), "B12", 2, "Hap1"),
+        (("Painted", "IV"), "IV", 2, None),
+        (("Painted", "X_V"), "X_V", 2, None),
+        (("Painted", "Xb"), "Scaffold_1", 1, "Xb"),
+        (("Painted", "HAP2", "Unloc"), "Scaffold_1", 1, "HAP2"),
+        ((), "ctg_1", 3, None),
+    ],
+)
+def test_make_scaffold_name(tags, name, rank, haplotype):
+    namer = ScaffoldNamer()
+    namer.make_scaffold_name(
+        Scaffold("Scaffold_1", rows=[Fragment("ctg_1", 1, 100, 1, tags)])
+    )
+    assert namer.current_scaffold_name == name
+    assert namer.current_rank == rank
+    assert namer.current_haplotype == haplotype
+
+
+def test_qc_sub_fragments():
+    ba = BuildAssembly("qc", bp_per_texel=10)
+    fnd = FoundFragment(Fragment("ctg", 1, 300, 1))
+
+    # Sub fragments which abut are fine in any order
+    ba.qc_sub_fragments(
+        fnd,
+        [
+            Fragment("ctg", 201, 300, 1),
+            Fragment("ctg", 1, 100, 1),
+            Fragment("ctg", 101, 200, 1),
+        ],
+    )
+
+    with pytest.raises(ValueError, match=r"Expecting 0 but got 1 overlaps"):
+        ba.qc_sub_fragments(
+            fnd, [Fragment("ctg", 1, 150, 1), Fragment("ctg", 150, 300, 1)]
+        )
+
+    with pytest.raises(ValueError, match=r"Gap of length 20 \(2\.0 pixels\)"):
+        ba.qc_sub_fragments(
+            fnd, [Fragment("ctg", 1, 140, 1), Fragment("ctg", 161, 300, 1)]
+        )
+
+
+def test_discard_overhanging_fragments():
+    # Discarding "ctg_b" from the end of the first OverlapResult leaves
+    # "ctg_x" at its end, which is then discarded from the start of the
+    # second OverlapResult in a second round.
+    w, x, b = (Fragment(f"ctg_{n}", 1, 100, 1) for n in "wxb")
+    olr1 = OverlapResult(Fragment("scf", 1, 205, 1), [w, x, b], 1, 300)
+    olr2 = OverlapResult(Fragment("scf", 206, 300, 1), [x, b], 101, 300)
+
+    ba = BuildAssembly("discard", bp_per_texel=10)
+    ba.store_fragments_found(olr1)
+    ba.store_fragments_found(olr2)
+    ba.discard_overhanging_fragments()
+
+    assert olr1.rows == [w, x]
+    assert (olr1.start, olr1.end) == (1, 200)
+    assert olr2.rows == [b]
+    assert (olr2.start, olr2.end) == (201, 300)
+    assert not ba.fragments_found_more_than_once
+
+
 def test_no_coord_changes():
     ia1 = make_random_assembly(seed="Random assembly")
 
@@ -1,3 +1,5 @@
+import sys
+
 import pytest
 
 from tola.assembly.fragment import Fragment
@@ -52,6 +54,15 @@ def test_equals():
     assert f1 != f5
 
 
+def test_name_is_interned():
+    name = "".join(("chr", "1"))
+    f1 = Fragment(name, 1, 100, 1)
+    f2 = Fragment("chr1", 101, 200, 1)
+    assert f1.name is f2.name
+    assert f1.name is sys.intern(name)
+    assert f1.reverse().name is f1.name
+
+
 def test_overlaps():
     f1 = Fragment("chr1", 1, 100, 1)
     f2 = Fragment("chr1", 100, 120, 1)
@@ -4,7 +4,7 @@ import pytest
 from tola.assembly.assembly import Assembly
 from tola.assembly.fragment import Fragment
 from tola.assembly.gap import Gap
-from tola.assembly.indexed_assembly import IndexedAssembly
+from tola.assembly.indexed_assembly import IndexedAssembly, overlap_span
 from tola.assembly.scaffold import Scaffold
 
 
@@ -135,6 +135,17 @@ def test_find_overlapping():
             print(Scaffold("correct answer", overlaps))
             assert overlaps == found.rows
 
+    # Batch search of shuffled baits gives the same results in bait order
+    shuffled = random.sample(bait_list, len(bait_list))
+    for bait, found in zip(shuffled, asm.find_overlaps_batch(shuffled), strict=True):
+        single = asm.find_overlaps(bait)
+        if single is None:
+            assert found is None
+        else:
+            assert found.bait is bait
+            assert (found.start, found.end) == (single.start, single.end)
+            assert found.rows == single.rows
+
     asm2 = IndexedAssembly(
         "single entry scaffold",
         scaffolds=[
@@ -148,6 +159,22 @@ def test_find_overlapping():
     assert asm2.find_overlaps(bait_list[0]).rows == [bait_list[0]]
 
 
+def test_overlap_span():
+    # Rows 1-100, 101-300, 301-500, 501-510
+    starts = [1, 101, 301, 501]
+    ends = [100, 300, 500, 510]
+
+    assert overlap_span(starts, ends, 1, 1) == (0, 0)
+    assert overlap_span(starts, ends, 100, 101) == (0, 1)
+    assert overlap_span(starts, ends, 150, 505) == (1, 3)
+    assert overlap_span(starts, ends, 510, 600) == (3, 3)
+    assert overlap_span(starts, ends, 511, 600) is None
+    assert overlap_span(starts, ends, -10, 0) is None
+    assert overlap_span(starts, ends, 150, 505, lo=1) == (1, 3)
+    assert overlap_span(starts, ends, 150, 505, lo=2) == (2, 3)
+    assert overlap_span(starts, ends, 1, 50, lo=1) is None
+
+
 def make_random_assembly(
     seed=None,
     scaffolds=3,
@@ -1,7 +1,7 @@
 import io
 
 import pytest
-from tola.assembly.parser import parse_agp, parse_tpf
+from tola.assembly.parser import canonical_tag, parse_agp, parse_tpf
 
 from .utils import strip_leading_spaces
 
@@ -52,6 +52,36 @@ def test_parse_agp():
     )
 
 
+@pytest.mark.parametrize(
+    ("tag", "canonical"),
+    [
+        ("Painted", "Painted"),
+        ("painted", "Painted"),
+        ("CONTAMINANT", "Contaminant"),
+        ("unloc", "Unloc"),
+        ("Hap1", "Hap1"),
+        ("X", "X"),
+    ],
+)
+def test_canonical_tag(tag, canonical):
+    assert canonical_tag(tag) == canonical
+
+
+def test_parse_agp_canonical_tags():
+    agp = strip_leading_spaces(
+        """
+        Scaffold_1	1	1000	1	W	scaffold_1	1	1000	+	painted	HAP1
+        Scaffold_1	1001	1100	2	U	100	scaffold	yes	proximity_ligation
+        Scaffold_1	1101	1600	3	W	scaffold_2	1	500	-	CONTAMINANT
+        """,
+    )
+
+    a1 = parse_agp(io.StringIO(agp), "canonical_tags")
+    frag_1, _, frag_2 = a1.scaffolds[0].rows
+    assert frag_1.tags == ("Painted", "HAP1")
+    assert frag_2.tags == ("Contaminant",)
+
+
 def test_parse_tpf():
     with pytest.raises(ValueError, match=r"Gap line before first sequence fragment"):
         parse_tpf(io.StringIO("GAP	TYPE-2	200"), "gap_first")
@@ -64,3 +64,17 @@ def test_reverse():
     s1r = s1.reverse()
     assert [x.strand for x in s1r.fragments()] == [-1, 1, -1]
     assert s1r.rows[2] is g1
+
+
+def test_fragment_tags():
+    s1 = Scaffold(
+        name="tags",
+        rows=[
+            Fragment("scaffold_12", 1, 20_000, 1, ("Painted", "X")),
+            Gap(100, "Type-2"),
+            Fragment("scaffold_12", 20_101, 40_000, 1, ("Painted", "Hap1")),
+            Fragment("scaffold_12", 40_001, 50_000, 1),
+        ],
+    )
+    assert s1.fragment_tags() == {"Painted", "X", "Hap1"}
+    assert Scaffold("empty").fragment_tags() == frozenset()